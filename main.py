@@ -5,15 +5,77 @@ Script principal de teste - Paradox Serial Interface
 Menu interativo para testar comunicação com centrais Paradox MG/SP.
 """
 
+import os
+import re
+import copy
 import sys
 import yaml
 import logging
 import time
+import functools
 from pathlib import Path
 
+# Usa o parser C da libyaml quando disponível (bem mais rápido)
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Inteiro decimal com sinal opcional (entrada de menus)
+_INT_RE = re.compile(r'-?\d+')
+
 # Importa módulos do projeto
 from paradox import SerialConnection, ParadoxPanel, protocol, commands
 
+# ===============================================================================
+# TEXTOS DA INTERFACE
+# ===============================================================================
+
+_BANNER = """
+╔═══════════════════════════════════════════════════════════╗
+║                                                           ║
+║      Paradox Serial Interface - Interface de Teste       ║
+║                                                           ║
+║  Comunicação com Centrais Paradox MG/SP via Serial TTL   ║
+║                                                           ║
+╚═══════════════════════════════════════════════════════════╝
+"""
+
+_MAIN_MENU = """
+╔════════════════════════════════════════════════════════╗
+║                    MENU PRINCIPAL                      ║
+╠════════════════════════════════════════════════════════╣
+║  1. Mostrar informações do painel                      ║
+║  2. Armar partição                                     ║
+║  3. Desarmar partição                                  ║
+║  4. Bypass de zona                                     ║
+║  5. Ler status/memória (EEPROM)                        ║
+║  6. Monitorar eventos em tempo real                    ║
+║  7. Sair                                               ║
+╚════════════════════════════════════════════════════════╝
+"""
+
+_ARM_MENU = """
+Modos de Armamento:
+  1. Arm (Regular/Away)
+  2. Arm Stay
+  3. Arm Sleep
+  4. Arm Instant
+  5. Arm Stay Instant
+  0. Voltar
+"""
+
+_PANEL_INFO_TEMPLATE = (
+    "\n" + "=" * 60 + "\n"
+    "INFORMAÇÕES DO PAINEL\n"
+    + "=" * 60 + "\n"
+    "Produto:          {0.product_name}\n"
+    "Firmware:         {0.firmware_string}\n"
+    "Panel ID:         {0.panel_id}\n"
+    "Source ID:        {0.source_id}\n"
+    + "=" * 60 + "\n"
+)
+
 
 def setup_logging(config):
     """
@@ -38,25 +100,27 @@ def setup_logging(config):
         }
         RESET = '\033[0m'
         
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Nomes coloridos pré-montados: format() faz só um lookup
+            self._colored = {
+                name: f"{color}{name}{self.RESET}"
+                for name, color in self.COLORS.items()
+            }
+        
         def format(self, record):
-            color = self.COLORS.get(record.levelname, self.RESET)
-            record.levelname = f"{color}{record.levelname}{self.RESET}"
+            record.levelname = self._colored.get(record.levelname, record.levelname)
             return super().format(record)
     
     # Configura handler
     handler = logging.StreamHandler()
+    log_format = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
     
-    # Tenta usar cores se possível
-    try:
-        formatter = ColoredFormatter(
-            '%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-            datefmt='%H:%M:%S'
-        )
-    except:
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-            datefmt='%H:%M:%S'
-        )
+    # Usa cores apenas em terminal (saída redirecionada/systemd fica sem ANSI)
+    if sys.stderr.isatty():
+        formatter = ColoredFormatter(log_format, datefmt='%H:%M:%S')
+    else:
+        formatter = logging.Formatter(log_format, datefmt='%H:%M:%S')
     
     handler.setFormatter(formatter)
     
@@ -66,6 +130,22 @@ def setup_logging(config):
     root_logger.addHandler(handler)
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_yaml(path, mtime):
+    """
+    Lê e faz parse de arquivo YAML (cache por caminho + mtime)
+    
+    Args:
+        path: str - caminho do arquivo
+        mtime: float - data de modificação (invalida o cache se mudar)
+    
+    Returns:
+        dict - conteúdo do arquivo (compartilhado pelo cache: não modificar)
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
 def load_config(config_path='config.yaml'):
     """
     Carrega arquivo de configuração
@@ -77,8 +157,8 @@ def load_config(config_path='config.yaml'):
         dict - configuração carregada
     """
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        # Cópia: alterações do chamador não podem vazar para o cache
+        config = copy.deepcopy(_parse_yaml(config_path, os.path.getmtime(config_path)))
         print(f"✓ Configuração carregada de {config_path}")
         return config
     except FileNotFoundError:
@@ -106,16 +186,7 @@ def load_config(config_path='config.yaml'):
 
 def print_banner():
     """Exibe banner do aplicativo"""
-    banner = """
-╔═══════════════════════════════════════════════════════════╗
-║                                                           ║
-║      Paradox Serial Interface - Interface de Teste       ║
-║                                                           ║
-║  Comunicação com Centrais Paradox MG/SP via Serial TTL   ║
-║                                                           ║
-╚═══════════════════════════════════════════════════════════╝
-"""
-    print(banner)
+    print(_BANNER)
 
 
 def print_panel_info(panel):
@@ -129,48 +200,35 @@ def print_panel_info(panel):
         print("✗ Informações do painel não disponíveis")
         return
     
-    info = panel.panel_info
-    
-    print("\n" + "="*60)
-    print("INFORMAÇÕES DO PAINEL")
-    print("="*60)
-    print(f"Produto:          {info.get('product_id', 'Desconhecido')}")
-    print(f"Firmware:         {info.get('firmware_string', 'N/A')}")
-    print(f"Panel ID:         {info.get('panel_id', 'N/A')}")
-    print(f"Source ID:        {info.get('source_id', 'N/A')}")
-    print("="*60 + "\n")
+    print(_PANEL_INFO_TEMPLATE.format(panel.panel_info))
 
 
 def show_main_menu():
     """Exibe menu principal"""
-    menu = """
-╔════════════════════════════════════════════════════════╗
-║                    MENU PRINCIPAL                      ║
-╠════════════════════════════════════════════════════════╣
-║  1. Mostrar informações do painel                      ║
-║  2. Armar partição                                     ║
-║  3. Desarmar partição                                  ║
-║  4. Bypass de zona                                     ║
-║  5. Ler status/memória (EEPROM)                        ║
-║  6. Monitorar eventos em tempo real                    ║
-║  7. Sair                                               ║
-╚════════════════════════════════════════════════════════╝
-"""
-    print(menu)
+    print(_MAIN_MENU)
 
 
 def show_arm_menu():
     """Exibe submenu de armamento"""
-    menu = """
-Modos de Armamento:
-  1. Arm (Regular/Away)
-  2. Arm Stay
-  3. Arm Sleep
-  4. Arm Instant
-  5. Arm Stay Instant
-  0. Voltar
-"""
-    print(menu)
+    print(_ARM_MENU)
+
+
+def _to_int(text):
+    """
+    Converte texto decimal para int
+    
+    Args:
+        text: str - texto já sem espaços
+    
+    Returns:
+        int - valor convertido
+    
+    Raises:
+        ValueError - se não for um inteiro decimal
+    """
+    if _INT_RE.fullmatch(text):
+        return int(text, 10)
+    raise ValueError(f"Inteiro inválido: {text!r}")
 
 
 def get_user_input(prompt, input_type=str, default=None):
@@ -189,6 +247,8 @@ def get_user_input(prompt, input_type=str, default=None):
         user_input = input(prompt).strip()
         if not user_input and default is not None:
             return default
+        if input_type is int:
+            return _to_int(user_input)
         return input_type(user_input)
     except (ValueError, KeyboardInterrupt):
         return default
@@ -326,18 +386,27 @@ def handle_monitor_events(panel):
     print("Pressione Ctrl+C para parar\n")
     
     try:
+        separator = '=' * 60
+        write = sys.stdout.write
         for event in panel.monitor_events():
-            print(f"\n{'='*60}")
-            print(f"EVENTO RECEBIDO")
-            print(f"{'='*60}")
-            print(f"Comando:      0x{event['command']:02X}")
-            print(f"Grupo:        {event['event_group']}")
-            print(f"Evento 1:     {event['event_1']}")
-            print(f"Evento 2:     {event['event_2']}")
-            print(f"Partição:     {event['partition']}")
-            print(f"Label Type:   {event['label_type']}")
-            print(f"Label:        {event['label']}")
-            print(f"{'='*60}\n")
+            # Monta o bloco inteiro e emite com uma única escrita
+            write("\n".join([
+                "",
+                separator,
+                "EVENTO RECEBIDO",
+                separator,
+                f"Comando:      0x{event.command:02X}",
+                f"Grupo:        {event.event_group}",
+                f"Evento 1:     {event.event_1}",
+                f"Evento 2:     {event.event_2}",
+                f"Partição:     {event.partition}",
+                f"Label Type:   {event.label_type}",
+                f"Label:        {event.label}",
+                separator,
+                "",
+                "",
+            ]))
+            sys.stdout.flush()
     except KeyboardInterrupt:
         print("\n✓ Monitoramento interrompido")
 
@@ -374,6 +443,7 @@ def main():
         
         print("Conectando à porta serial...")
         connection.connect()
+        connection.start_reader()
         print("✓ Conexão serial estabelecida\n")
         
     except Exception as e:
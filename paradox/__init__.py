@@ -11,13 +11,15 @@ __version__ = "0.1.0"
 __author__ = "Paradox Serial Interface Project"
 
 from .connection import SerialConnection
-from .panel import ParadoxPanel
+from .panel import ParadoxPanel, PanelInfo, Event
 from . import protocol
 from . import commands
 
 __all__ = [
     'SerialConnection',
     'ParadoxPanel',
+    'PanelInfo',
+    'Event',
     'protocol',
     'commands',
 ]
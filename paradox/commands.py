@@ -9,6 +9,31 @@ from . import protocol
 
 logger = logging.getLogger(__name__)
 
+# Tabela de tradução para a coluna ASCII do hexdump (não-imprimíveis -> '.')
+_PRINTABLE_TABLE = bytes(b if 32 <= b < 127 else ord('.') for b in range(256))
+
+# Resultados de PerformAction
+# 0x40 = sucesso
+# 0x41-0x4F = diferentes resultados
+_PERFORM_ACTION_RESULT = {
+    0x40: "success",
+    0x41: "fail",
+    0x42: "invalid_argument",
+    0x43: "user_code_required",
+}
+
+
+def _build_action_name_index():
+    """Constrói índice reverso código -> nome (primeira ocorrência prevalece)"""
+    index = {}
+    for action_dict in [protocol.PARTITION_ACTIONS, protocol.ZONE_ACTIONS, protocol.PGM_ACTIONS]:
+        for name, code in action_dict.items():
+            index.setdefault(code, name)  # 0x10 -> 'bypass', não 'clear_bypass'
+    return index
+
+
+_ACTION_NAME_BY_CODE = _build_action_name_index()
+
 
 def send_initiate_communication(connection):
     """
@@ -18,7 +43,7 @@ def send_initiate_communication(connection):
         connection: SerialConnection - conexão serial
     
     Returns:
-        bytes - dados enviados
+        bytearray - dados enviados
     """
     logger.debug("Enviando InitiateCommunication")
     cmd = protocol.build_initiate_communication(user_id=0x00)
@@ -38,7 +63,7 @@ def send_initialize_mgsp(connection, password, product_id, firmware, panel_id):
         panel_id: int - ID do painel
     
     Returns:
-        bytes - dados enviados
+        bytearray - dados enviados
     """
     logger.debug("Enviando InitializeCommunication MG/SP")
     cmd = protocol.build_initialize_communication_mgsp(
@@ -63,9 +88,9 @@ def send_arm_command(connection, partition, action_code):
         action_code: int - código da ação (ver protocol.PARTITION_ACTIONS)
     
     Returns:
-        bytes - dados enviados
+        bytearray - dados enviados
     """
-    logger.debug(f"Enviando comando de armamento: partição={partition}, ação=0x{action_code:02X}")
+    logger.debug("Enviando comando de armamento: partição=%d, ação=0x%02X", partition, action_code)
     cmd = protocol.build_perform_action(
         action=action_code,
         argument=partition,
@@ -85,11 +110,11 @@ def send_bypass_command(connection, zone):
         zone: int - número da zona (0-191, 0-indexed)
     
     Returns:
-        bytes - dados enviados
+        bytearray - dados enviados
     """
-    logger.debug(f"Enviando comando de bypass: zona={zone}")
+    logger.debug("Enviando comando de bypass: zona=%d", zone)
     cmd = protocol.build_perform_action(
-        action=protocol.ZONE_ACTIONS['bypass'],
+        action=protocol.BYPASS,
         argument=zone,
         source_id=0x01,
         user_id=0x00
@@ -108,9 +133,9 @@ def send_read_eeprom(connection, address, records=1):
         records: int - número de registros
     
     Returns:
-        bytes - dados enviados
+        bytearray - dados enviados
     """
-    logger.debug(f"Enviando comando de leitura EEPROM: endereço=0x{address:04X}, registros={records}")
+    logger.debug("Enviando comando de leitura EEPROM: endereço=0x%04X, registros=%d", address, records)
     cmd = protocol.build_read_eeprom(
         address=address,
         records=records,
@@ -135,21 +160,46 @@ def validate_checksum(data):
         logger.warning("Mensagem muito curta para validar checksum")
         return False
     
-    # Último byte é o checksum
+    # Último byte é o checksum (memoryview evita copiar o payload)
     received_checksum = data[-1]
-    calculated_checksum = protocol.calculate_checksum(data[:-1])
+    calculated_checksum = protocol.calculate_checksum(memoryview(data)[:-1])
     
     valid = (received_checksum == calculated_checksum)
     
     if not valid:
-        logger.warning(f"Checksum inválido: recebido=0x{received_checksum:02X}, "
-                      f"calculado=0x{calculated_checksum:02X}")
+        logger.warning("Checksum inválido: recebido=0x%02X, calculado=0x%02X",
+                       received_checksum, calculated_checksum)
     else:
-        logger.debug(f"Checksum válido: 0x{received_checksum:02X}")
+        logger.debug("Checksum válido: 0x%02X", received_checksum)
     
     return valid
 
 
+def validate_checksums_batch(frames):
+    """
+    Valida checksum de várias mensagens recebidas
+    
+    Args:
+        frames: iterable de bytes - mensagens completas
+    
+    Returns:
+        list - bool por mensagem (True se checksum válido)
+    """
+    calculate_checksum = protocol.calculate_checksum
+    results = []
+    for frame in frames:
+        if len(frame) < 2:
+            results.append(False)
+            continue
+        results.append(frame[-1] == calculate_checksum(memoryview(frame)[:-1]))
+    
+    invalid = results.count(False)
+    if invalid:
+        logger.warning("Checksum inválido em %d de %d mensagens", invalid, len(results))
+    
+    return results
+
+
 def parse_perform_action_response(data):
     """
     Faz parse de resposta PerformAction
@@ -164,17 +214,7 @@ def parse_perform_action_response(data):
         return None
     
     command = data[0]
-    
-    # 0x40 = sucesso
-    # 0x41-0x4F = diferentes resultados
-    result_codes = {
-        0x40: "success",
-        0x41: "fail",
-        0x42: "invalid_argument",
-        0x43: "user_code_required",
-    }
-    
-    result = result_codes.get(command, "unknown")
+    result = _PERFORM_ACTION_RESULT.get(command, "unknown")
     
     info = {
         'command': command,
@@ -182,7 +222,7 @@ def parse_perform_action_response(data):
         'success': (command == 0x40)
     }
     
-    logger.debug(f"PerformAction response: 0x{command:02X} ({result})")
+    logger.debug("PerformAction response: 0x%02X (%s)", command, result)
     
     return info
 
@@ -198,22 +238,22 @@ def parse_read_eeprom_response(data):
         dict - informações da resposta ou None
     """
     try:
-        parsed = protocol.ReadEEPROMResponse.parse(data)
+        parsed = protocol.parse_read_eeprom_response(data)
         
         info = {
-            'command': parsed.fields.po.command,
-            'address': parsed.fields.address,
-            'records': parsed.fields.records,
-            'data': parsed.fields.data,
+            'command': parsed.command,
+            'address': parsed.address,
+            'records': parsed.records,
+            'data': parsed.data,
         }
         
-        logger.debug(f"ReadEEPROM response: endereço=0x{info['address']:04X}, "
-                    f"registros={info['records']}, bytes={len(info['data'])}")
+        logger.debug("ReadEEPROM response: endereço=0x%04X, registros=%d, bytes=%d",
+                     info['address'], info['records'], len(info['data']))
         
         return info
         
     except Exception as e:
-        logger.error(f"Erro ao fazer parse de ReadEEPROM response: {e}")
+        logger.error("Erro ao fazer parse de ReadEEPROM response: %s", e)
         return None
 
 
@@ -227,11 +267,9 @@ def get_action_name(action_code):
     Returns:
         str - nome da ação ou "unknown"
     """
-    # Inverte dicionários para busca reversa
-    for action_dict in [protocol.PARTITION_ACTIONS, protocol.ZONE_ACTIONS, protocol.PGM_ACTIONS]:
-        for name, code in action_dict.items():
-            if code == action_code:
-                return name
+    name = _ACTION_NAME_BY_CODE.get(action_code)
+    if name is not None:
+        return name
     
     return f"unknown_0x{action_code:02X}"
 
@@ -247,7 +285,9 @@ def format_hex_dump(data, bytes_per_line=16):
     Returns:
         str - representação hexdump
     """
+    data = bytes(data)  # aceita bytearray/memoryview (translate exige bytes)
     lines = []
+    lines_append = lines.append
     
     for i in range(0, len(data), bytes_per_line):
         chunk = data[i:i+bytes_per_line]
@@ -256,12 +296,12 @@ def format_hex_dump(data, bytes_per_line=16):
         offset = f"{i:04X}"
         
         # Bytes em hex
-        hex_part = ' '.join([f"{b:02X}" for b in chunk])
+        hex_part = chunk.hex(' ').upper()
         hex_part = hex_part.ljust(bytes_per_line * 3)
         
         # ASCII (printable chars)
-        ascii_part = ''.join([chr(b) if 32 <= b < 127 else '.' for b in chunk])
+        ascii_part = chunk.translate(_PRINTABLE_TABLE).decode('latin-1')
         
-        lines.append(f"{offset}  {hex_part}  {ascii_part}")
+        lines_append(f"{offset}  {hex_part}  {ascii_part}")
     
     return '\n'.join(lines)
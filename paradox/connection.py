@@ -6,10 +6,43 @@ Implementa a camada de comunicação serial com logging detalhado.
 
 import serial
 import logging
+import os
+import queue
+import select
+import threading
 import time
 
+try:
+    import fcntl
+    import termios
+except ImportError:  # Windows
+    fcntl = None
+    termios = None
+
 logger = logging.getLogger(__name__)
 
+# Intervalo máximo de cada espera da thread leitora: limita quanto tempo ela
+# leva para notar um pedido de parada (stop_reader)
+_READER_POLL = 0.1
+
+
+def _message_length(first_byte, max_length=37):
+    """
+    Determina tamanho da mensagem a partir do primeiro byte
+    
+    Args:
+        first_byte: int - primeiro byte da mensagem
+        max_length: int - tamanho máximo
+    
+    Returns:
+        int - tamanho esperado da mensagem
+    """
+    if first_byte > 4:
+        # Tamanho pode estar no primeiro byte
+        return min(first_byte, max_length)
+    # Mensagem padrão de 37 bytes
+    return 37
+
 
 class SerialConnection:
     """
@@ -35,6 +68,16 @@ class SerialConnection:
         self.timeout = timeout
         self.serial = None
         self._connected = False
+        self._read = None   # self.serial.read (método ligado, cache)
+        self._write = None  # self.serial.write (método ligado, cache)
+        self._rx_pending = bytearray()  # bytes lidos além do quadro atual
+        self._rx_lock = threading.Lock()  # protege _rx_pending (thread leitora x flush)
+        self._fd = None  # descritor POSIX da porta (None se indisponível)
+        self.rx_queue = None  # mensagens recebidas pela thread leitora
+        self._reader_thread = None
+        self._reader_stop = threading.Event()
+        self._reader_error = None  # exceção que encerrou a thread leitora
+        self._reader_saved_timeout = None  # timeout da porta antes da thread (sem fd)
         
     def connect(self):
         """
@@ -47,7 +90,7 @@ class SerialConnection:
             serial.SerialException - se falhar ao abrir porta
         """
         try:
-            logger.info(f"Conectando à porta {self.port} @ {self.baudrate} baud")
+            logger.info("Conectando à porta %s @ %d baud", self.port, self.baudrate)
             self.serial = serial.Serial(
                 port=self.port,
                 baudrate=self.baudrate,
@@ -58,21 +101,46 @@ class SerialConnection:
                 write_timeout=self.timeout
             )
             self._connected = True
+            self._read = self.serial.read
+            self._write = self.serial.write
+            self._fd = self._fileno()
+            self._set_low_latency()
             logger.info("Conexão serial estabelecida com sucesso")
             return True
         except serial.SerialException as e:
-            logger.error(f"Erro ao abrir porta serial: {e}")
+            logger.error("Erro ao abrir porta serial: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Erro inesperado ao conectar: {e}")
+            logger.error("Erro inesperado ao conectar: %s", e)
             raise
     
+    def _set_low_latency(self):
+        """
+        Ativa modo low latency (ASYNC_LOW_LATENCY) no driver, se suportado
+        
+        Adaptadores USB (FTDI/CP210x) acumulam bytes por até 16ms antes de
+        entregá-los; o handshake Paradox troca muitas mensagens curtas.
+        Silenciosamente ignorado fora do Linux ou em drivers sem suporte.
+        """
+        set_low_latency_mode = getattr(self.serial, 'set_low_latency_mode', None)
+        if set_low_latency_mode is None:
+            return
+        try:
+            set_low_latency_mode(True)
+            logger.debug("Modo low latency ativado")
+        except (ValueError, OSError) as e:
+            logger.debug("Modo low latency não suportado: %s", e)
+    
     def disconnect(self):
         """Fecha porta serial"""
+        self.stop_reader()
         if self.serial and self.serial.is_open:
             logger.info("Fechando conexão serial")
             self.serial.close()
             self._connected = False
+            self._read = None
+            self._write = None
+            self._fd = None
     
     def is_connected(self):
         """Verifica se conexão está ativa"""
@@ -91,25 +159,77 @@ class SerialConnection:
         Raises:
             serial.SerialException - se erro ao enviar
         """
-        if not self.is_connected():
+        if not self._connected:
             raise serial.SerialException("Porta serial não está conectada")
         
         try:
             # Log em hexadecimal
-            hex_data = ' '.join([f'{b:02X}' for b in data])
-            logger.debug(f"TX ({len(data)} bytes): {hex_data}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("TX (%d bytes): %s", len(data), data.hex(' ').upper())
             
-            bytes_written = self.serial.write(data)
-            self.serial.flush()  # Garante que dados são enviados
+            # write() já bloqueia até o SO aceitar os bytes; flush() (tcdrain)
+            # apenas dobraria o custo esperando o FIFO de TX esvaziar
+            return self._write(data)
+        except serial.SerialTimeoutException:
+            logger.error("Timeout ao enviar dados")
+            raise
+        except Exception as e:
+            logger.error("Erro ao enviar dados: %s", e)
+            raise
+    
+    def write_many(self, frames):
+        """
+        Envia várias mensagens numa única escrita na porta serial
+        
+        Args:
+            frames: iterable de bytes - mensagens a enviar, em ordem
+        
+        Returns:
+            int - número total de bytes enviados
+        
+        Raises:
+            serial.SerialException - se erro ao enviar
+        """
+        if not self._connected:
+            raise serial.SerialException("Porta serial não está conectada")
+        
+        frames = list(frames)
+        data = b''.join(frames)
+        
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("TX (%d bytes, %d mensagens): %s",
+                             len(data), len(frames), data.hex(' ').upper())
             
-            return bytes_written
+            return self._write(data)
         except serial.SerialTimeoutException:
             logger.error("Timeout ao enviar dados")
             raise
         except Exception as e:
-            logger.error(f"Erro ao enviar dados: {e}")
+            logger.error("Erro ao enviar dados: %s", e)
             raise
     
+    def drain(self):
+        """Aguarda até todos os dados pendentes serem transmitidos (tcdrain)"""
+        if self.is_connected():
+            if self._fd is not None and termios is not None:
+                termios.tcdrain(self._fd)
+            else:
+                self.serial.flush()
+    
+    def _check_direct_read(self):
+        """
+        Garante que a porta pode ser lida diretamente por este chamador
+        
+        Raises:
+            serial.SerialException - se desconectado ou thread leitora ativa
+        """
+        if not self._connected:
+            raise serial.SerialException("Porta serial não está conectada")
+        if self.rx_queue is not None:
+            # A thread leitora é dona do descritor e do buffer pendente
+            raise serial.SerialException("Thread leitora ativa - use receive()")
+    
     def read(self, length):
         """
         Lê número específico de bytes com logging
@@ -121,24 +241,32 @@ class SerialConnection:
             bytes - dados lidos (pode ser menor que length se timeout)
         
         Raises:
-            serial.SerialException - se erro ao ler
+            serial.SerialException - se erro ao ler ou thread leitora ativa
         """
-        if not self.is_connected():
-            raise serial.SerialException("Porta serial não está conectada")
+        self._check_direct_read()
         
         try:
-            data = self.serial.read(length)
+            with self._rx_lock:
+                pending = self._rx_pending
+                if pending:
+                    # Consome primeiro bytes já lidos por read_variable_length()
+                    data = bytes(pending[:length])
+                    del pending[:length]
+                    if len(data) < length:
+                        data += self._read(length - len(data))
+                else:
+                    data = self._read(length)
             
             if len(data) > 0:
                 # Log em hexadecimal
-                hex_data = ' '.join([f'{b:02X}' for b in data])
-                logger.debug(f"RX ({len(data)} bytes): {hex_data}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("RX (%d bytes): %s", len(data), data.hex(' ').upper())
             else:
-                logger.debug(f"RX: Nenhum dado recebido (timeout)")
+                logger.debug("RX: Nenhum dado recebido (timeout)")
             
             return data
         except Exception as e:
-            logger.error(f"Erro ao ler dados: {e}")
+            logger.error("Erro ao ler dados: %s", e)
             raise
     
     def read_variable_length(self, max_length=37, initial_timeout=None):
@@ -155,52 +283,462 @@ class SerialConnection:
         
         Returns:
             bytes - mensagem completa lida
+        
+        Raises:
+            serial.SerialException - se erro ao ler ou thread leitora ativa
         """
-        if not self.is_connected():
+        self._check_direct_read()
+        return self._read_frame(max_length, initial_timeout)
+    
+    def _read_frame(self, max_length=37, initial_timeout=None):
+        """
+        Lê próxima mensagem (sem checar a thread leitora, que também usa este método)
+        
+        Args:
+            max_length: int - tamanho máximo a ler
+            initial_timeout: float - timeout para primeiro byte (usa self.timeout se None)
+        
+        Returns:
+            bytes - mensagem completa lida (b'' se nada foi recebido)
+        """
+        pending = self._rx_pending
+        with self._rx_lock:
+            length = self._fill_frame(max_length, initial_timeout)
+            if not length:
+                return b''
+            
+            data = bytes(pending[:length])
+            del pending[:length]
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("RX (%d bytes): %s", length, data.hex(' ').upper())
+        
+        return data
+    
+    def read_into(self, buf, initial_timeout=None):
+        """
+        Lê mensagem de tamanho variável diretamente num buffer pré-alocado
+        
+        Mesmo enquadramento de read_variable_length(), mas sem criar um
+        objeto bytes por quadro: o chamador reaproveita o mesmo buffer.
+        
+        Args:
+            buf: bytearray - buffer de destino (mínimo 37 bytes; mensagens
+                 com primeiro byte <= 4 sempre têm 37 bytes)
+            initial_timeout: float - timeout para primeiro byte (usa self.timeout se None)
+        
+        Returns:
+            int - número de bytes escritos em buf (0 se nada foi recebido)
+        
+        Raises:
+            ValueError - se buf tiver menos de 37 bytes
+            serial.SerialException - se erro ao ler ou thread leitora ativa
+        """
+        if len(buf) < 37:
+            # Escrever além do fim redimensionaria buf (ou falharia com
+            # BufferError se houver memoryview exportada)
+            raise ValueError("Buffer de recepção deve ter ao menos 37 bytes")
+        self._check_direct_read()
+        
+        pending = self._rx_pending
+        with self._rx_lock:
+            length = self._fill_frame(37, initial_timeout)
+            if not length:
+                return 0
+            
+            # memoryview evita a cópia intermediária do slice; precisa ser
+            # liberada antes de redimensionar o bytearray pendente
+            with memoryview(pending) as view:
+                buf[:length] = view[:length]
+            del pending[:length]
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("RX (%d bytes): %s", length, buf[:length].hex(' ').upper())
+        
+        return length
+    
+    def _fill_frame(self, max_length, initial_timeout):
+        """
+        Garante que o próximo quadro esteja no início de _rx_pending
+        
+        Args:
+            max_length: int - tamanho máximo do quadro
+            initial_timeout: float - timeout para primeiro byte (usa self.timeout se None)
+        
+        Returns:
+            int - bytes do quadro disponíveis em _rx_pending (0 se nada recebido)
+        """
+        if not self._connected:
             raise serial.SerialException("Porta serial não está conectada")
         
+        ser = self.serial
+        read = self._read
+        pending = self._rx_pending
+        fd = self._fd
+        
         # Salva timeout original
-        original_timeout = self.serial.timeout
-        if initial_timeout is not None:
-            self.serial.timeout = initial_timeout
+        original_timeout = ser.timeout
+        first_timeout = original_timeout if initial_timeout is None else initial_timeout
+        # Timeout para o resto do quadro (com a thread leitora sem fd,
+        # ser.timeout é a fatia curta; o limite é o timeout anterior)
+        frame_timeout = original_timeout
+        if self._reader_saved_timeout is not None:
+            frame_timeout = self._reader_saved_timeout
+        timeout_changed = (fd is None and initial_timeout is not None
+                           and initial_timeout != original_timeout)
+        if timeout_changed:
+            ser.timeout = initial_timeout
         
         try:
-            # Lê primeiro byte para determinar tamanho
-            first_byte = self.serial.read(1)
-            if len(first_byte) == 0:
-                self.serial.timeout = original_timeout
-                return b''
+            if fd is not None:
+                # POSIX: aguarda prontidão e drena o disponível numa única os.read()
+                if not pending:
+                    self._select_read(fd, 1, max_length, first_timeout)
+            elif not pending and ser.in_waiting >= max_length:
+                # Quadro completo já está no buffer: uma única leitura
+                pending += read(max_length)
+            elif not pending:
+                # Lê primeiro byte para determinar tamanho
+                pending += read(1)
             
             # Restaura timeout original para resto da mensagem
-            self.serial.timeout = original_timeout
+            if timeout_changed:
+                ser.timeout = original_timeout
             
-            # Determina tamanho da mensagem
-            if first_byte[0] > 4:
-                # Tamanho pode estar no primeiro byte
-                message_length = first_byte[0]
-                if message_length > max_length:
-                    message_length = max_length
-            else:
-                # Mensagem padrão de 37 bytes
-                message_length = 37
+            if not pending:
+                return 0
             
-            # Lê restante da mensagem
-            remaining = message_length - 1
-            rest = self.serial.read(remaining)
+            # Determina tamanho da mensagem
+            message_length = _message_length(pending[0], max_length)
             
-            data = first_byte + rest
+            # Lê restante da mensagem (ou guarda o excedente para a próxima)
+            remaining = message_length - len(pending)
+            if remaining > 0:
+                if fd is not None:
+                    self._select_read(fd, message_length, max_length, frame_timeout)
+                else:
+                    self._read_remaining(message_length, frame_timeout)
             
-            if len(data) > 0:
-                hex_data = ' '.join([f'{b:02X}' for b in data])
-                logger.debug(f"RX ({len(data)} bytes): {hex_data}")
-            
-            return data
+            return min(message_length, len(pending))
             
         except Exception as e:
-            logger.error(f"Erro ao ler mensagem de tamanho variável: {e}")
-            self.serial.timeout = original_timeout
+            logger.error("Erro ao ler mensagem de tamanho variável: %s", e)
+            # Só restaura se alterou: reconfigurar uma porta removida
+            # mascararia o erro original
+            if timeout_changed:
+                ser.timeout = original_timeout
             raise
     
+    def read_stream(self, duration=None, max_length=37, poll_interval=1.0):
+        """
+        Lê mensagens continuamente (monitoramento)
+        
+        Em POSIX drena tudo o que chegou com um único os.read() por rajada
+        (descritor em modo não-bloqueante) e separa as mensagens do buffer;
+        nas demais plataformas lê de uma vez o que in_waiting indicar e,
+        sem dados, aguarda o próximo byte limitado a poll_interval.
+        
+        Args:
+            duration: float - duração em segundos (None = indefinido)
+            max_length: int - tamanho máximo de mensagem (default 37)
+            poll_interval: float - intervalo máximo de espera por dados
+        
+        Yields:
+            bytes - mensagens completas recebidas
+        """
+        if not self.is_connected():
+            raise serial.SerialException("Porta serial não está conectada")
+        
+        deadline = None if duration is None else time.monotonic() + duration
+        fd = self._fd
+        
+        if self.rx_queue is not None:
+            # Thread leitora ativa: ela é a única que lê da porta
+            while deadline is None or time.monotonic() < deadline:
+                wait = poll_interval
+                if deadline is not None:
+                    wait = min(wait, max(deadline - time.monotonic(), 0))
+                data = self.receive(wait)
+                if data:
+                    yield data
+            return
+        
+        pending = self._rx_pending
+        
+        if fd is None or fcntl is None:
+            ser = self.serial
+            read = self._read
+            original_timeout = ser.timeout
+            try:
+                while True:
+                    # Separa todas as mensagens completas já recebidas;
+                    # quadros parciais ficam pendentes até completarem
+                    yield from self._split_frames(max_length)
+                    
+                    wait = poll_interval
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        wait = min(wait, remaining)
+                    
+                    # Rajada já no buffer do driver: uma única leitura para todos os quadros
+                    waiting = ser.in_waiting
+                    if waiting:
+                        pending += read(waiting)
+                        continue
+                    
+                    # Nada disponível: aguarda o próximo byte por no máximo wait
+                    if ser.timeout != wait:
+                        ser.timeout = wait
+                    pending += read(1)
+            finally:
+                if ser.timeout != original_timeout:
+                    ser.timeout = original_timeout
+            return
+        
+        original_flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, original_flags | os.O_NONBLOCK)
+        
+        try:
+            while True:
+                # Separa todas as mensagens completas já recebidas
+                yield from self._split_frames(max_length)
+                
+                wait = poll_interval
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    wait = min(wait, remaining)
+                
+                ready, _, _ = select.select([fd], [], [], wait)
+                if not ready:
+                    continue
+                
+                try:
+                    chunk = os.read(fd, 4096)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    raise serial.SerialException(
+                        "Porta sinalizou dados mas nada foi lido (dispositivo desconectado?)")
+                pending += chunk
+        finally:
+            fcntl.fcntl(fd, fcntl.F_SETFL, original_flags)
+    
+    def _split_frames(self, max_length):
+        """
+        Separa as mensagens completas acumuladas em _rx_pending
+        
+        Args:
+            max_length: int - tamanho máximo de mensagem
+        
+        Yields:
+            bytes - mensagens completas, na ordem de chegada
+        """
+        pending = self._rx_pending
+        debug = logger.isEnabledFor(logging.DEBUG)
+        while pending:
+            message_length = _message_length(pending[0], max_length)
+            if len(pending) < message_length:
+                break
+            data = bytes(pending[:message_length])
+            del pending[:message_length]
+            if debug:
+                logger.debug("RX (%d bytes): %s", len(data), data.hex(' ').upper())
+            yield data
+    
+    def start_reader(self):
+        """
+        Inicia thread leitora em segundo plano
+        
+        A thread lê mensagens continuamente e as coloca em rx_queue como
+        tuplas (bytes, instante de recepção), permitindo enviar o próximo
+        comando enquanto a resposta anterior ainda está sendo recebida.
+        Enquanto ativa, read*() levantam SerialException: use receive()
+        (ou ParadoxPanel).
+        """
+        if not self.is_connected():
+            raise serial.SerialException("Porta serial não está conectada")
+        if self._reader_thread is not None:
+            return
+        
+        self.rx_queue = queue.Queue(maxsize=64)
+        self._reader_error = None
+        self._reader_stop.clear()
+        if self._fd is None:
+            # Sem select(): a thread lê com timeout curto para notar a parada.
+            # Configurado uma única vez (cada troca reconfigura a porta)
+            self._reader_saved_timeout = self.serial.timeout
+            self.serial.timeout = _READER_POLL
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop, name="paradox-rx", daemon=True)
+        self._reader_thread.start()
+        logger.debug("Thread leitora iniciada")
+    
+    def stop_reader(self):
+        """Para a thread leitora (se ativa) e descarta a fila de recepção"""
+        thread = self._reader_thread
+        if thread is None:
+            return
+        
+        self._reader_stop.set()
+        if thread is not threading.current_thread():
+            # Esperas da thread são fatiadas em _READER_POLL: o join é curto
+            # e a porta só é fechada/reusada depois que ela terminou
+            thread.join()
+        self._reader_thread = None
+        self.rx_queue = None
+        self._reader_stop.clear()
+        if self._reader_saved_timeout is not None:
+            if self.serial is not None and self.serial.is_open:
+                self.serial.timeout = self._reader_saved_timeout
+            self._reader_saved_timeout = None
+        logger.debug("Thread leitora finalizada")
+    
+    def _reader_loop(self):
+        """Laço da thread leitora: lê mensagens e as enfileira"""
+        stop = self._reader_stop
+        rx_queue = self.rx_queue
+        
+        while not stop.is_set():
+            try:
+                data = self._read_frame(initial_timeout=_READER_POLL)
+            except Exception as e:
+                logger.error("Thread leitora interrompida: %s", e)
+                # Guarda o erro e acorda quem espera na fila: receive()
+                # relança a exceção em vez de aguardar o timeout inteiro
+                self._reader_error = e
+                self._enqueue(rx_queue, (None, time.monotonic()))
+                break
+            
+            if data:
+                self._enqueue(rx_queue, (data, time.monotonic()))
+    
+    @staticmethod
+    def _enqueue(rx_queue, item):
+        """
+        Coloca item na fila de recepção, descartando o mais antigo se cheia
+        
+        Args:
+            rx_queue: queue.Queue - fila de recepção
+            item: tuple - (bytes ou None, instante de recepção)
+        """
+        try:
+            rx_queue.put_nowait(item)
+        except queue.Full:
+            # Ninguém consumindo (ex: menu ocioso): descarta a mais antiga.
+            # Só a thread leitora produz, então há espaço após o get_nowait()
+            try:
+                rx_queue.get_nowait()
+            except queue.Empty:
+                pass
+            rx_queue.put_nowait(item)
+            logger.debug("Fila de recepção cheia - mensagem mais antiga descartada")
+    
+    def receive(self, timeout=None):
+        """
+        Retorna próxima mensagem recebida pela thread leitora
+        
+        Args:
+            timeout: float - tempo máximo de espera (None = sem limite)
+        
+        Returns:
+            bytes - mensagem recebida ou b'' se timeout
+        
+        Raises:
+            Exception - erro que encerrou a thread leitora (ex: porta removida)
+        """
+        if self.rx_queue is None:
+            raise serial.SerialException("Thread leitora não está ativa")
+        if self._reader_error is not None:
+            raise self._reader_error
+        
+        try:
+            data, _ = self.rx_queue.get(timeout=timeout)
+        except queue.Empty:
+            return b''
+        if data is None:
+            # Marcador enfileirado pela thread leitora ao encerrar com erro
+            raise self._reader_error
+        return data
+    
+    def _fileno(self):
+        """
+        Retorna descritor da porta para leitura via select(), se suportado
+        
+        Returns:
+            int - descritor ou None (Windows, portas por URL, etc)
+        """
+        if os.name != 'posix':
+            return None
+        try:
+            return self.serial.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+    
+    def _read_remaining(self, size, timeout):
+        """
+        Lê via pyserial até o buffer pendente ter size bytes ou expirar timeout
+        
+        Repete a leitura enquanto ser.timeout for menor que timeout (thread
+        leitora), parando antes se stop_reader() for chamado.
+        
+        Args:
+            size: int - bytes necessários no buffer pendente
+            timeout: float - timeout total em segundos (None = sem limite)
+        """
+        pending = self._rx_pending
+        read = self._read
+        stop = self._reader_stop
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            pending += read(size - len(pending))
+            if len(pending) >= size or stop.is_set():
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+    
+    def _select_read(self, fd, size, drain, timeout):
+        """
+        Lê do descritor até o buffer pendente ter size bytes ou expirar timeout
+        
+        Cada leitura drena até drain bytes de uma vez; o excedente fica
+        no buffer pendente para a próxima mensagem.
+        
+        Args:
+            fd: int - descritor da porta
+            size: int - bytes necessários no buffer pendente
+            drain: int - máximo de bytes a manter após cada leitura
+            timeout: float - timeout total em segundos (None = sem limite)
+        """
+        pending = self._rx_pending
+        stop = self._reader_stop
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        # Esperas fatiadas em _READER_POLL para a thread leitora notar a parada
+        while len(pending) < size and not stop.is_set():
+            wait = _READER_POLL
+            if deadline is not None:
+                # Sempre consulta o descritor ao menos uma vez: timeout 0
+                # ainda devolve o que já está disponível (como o pyserial)
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            
+            ready, _, _ = select.select([fd], [], [], wait)
+            if not ready:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                continue
+            
+            chunk = os.read(fd, max(drain, size) - len(pending))
+            if not chunk:
+                # Mesmo comportamento do pyserial para porta removida
+                raise serial.SerialException(
+                    "Porta sinalizou dados mas nada foi lido (dispositivo desconectado?)")
+            pending += chunk
+    
     def available(self):
         """
         Retorna número de bytes disponíveis no buffer
@@ -210,18 +748,34 @@ class SerialConnection:
         """
         if not self.is_connected():
             return 0
-        return self.serial.in_waiting
+        return len(self._rx_pending) + self.serial.in_waiting
     
     def flush_input(self):
         """Limpa buffer de entrada"""
         if self.is_connected():
-            self.serial.reset_input_buffer()
+            # Com a thread leitora ativa, aguarda ela terminar o quadro em
+            # andamento: limpar no meio truncaria a próxima mensagem
+            with self._rx_lock:
+                if self._fd is not None and termios is not None:
+                    termios.tcflush(self._fd, termios.TCIFLUSH)
+                else:
+                    self.serial.reset_input_buffer()
+                self._rx_pending.clear()
+            if self.rx_queue is not None:
+                try:
+                    while True:
+                        self.rx_queue.get_nowait()
+                except queue.Empty:
+                    pass
             logger.debug("Buffer de entrada limpo")
     
     def flush_output(self):
         """Limpa buffer de saída"""
         if self.is_connected():
-            self.serial.reset_output_buffer()
+            if self._fd is not None and termios is not None:
+                termios.tcflush(self._fd, termios.TCOFLUSH)
+            else:
+                self.serial.reset_output_buffer()
             logger.debug("Buffer de saída limpo")
     
     def __enter__(self):
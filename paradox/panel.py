@@ -6,11 +6,106 @@ Implementa a interface de alto nível para comunicação com painéis Paradox.
 
 import logging
 import time
+from dataclasses import dataclass
 from . import protocol
 from .connection import SerialConnection
 
 logger = logging.getLogger(__name__)
 
+# Comandos de resposta esperados (membership O(1), sem alocar por chamada)
+_INITIALIZE_RESPONSES = frozenset((0x10, 0x70))
+_PERFORM_ACTION_RESPONSES = frozenset(range(0x40, 0x50))
+_EEPROM_RESPONSES = frozenset(range(0x50, 0x60))
+
+# Mensagens de log de PerformAction: (início, sucesso, resposta inesperada,
+# timeout). Início recebe todos os argumentos de log; sucesso só o primeiro
+_ARM_MESSAGES = (
+    "Armando partição %s (modo: %s)",
+    "Partição %s armada com sucesso",
+    "Resposta inesperada ao armar: 0x%02X",
+    "Timeout ao aguardar confirmação de armamento",
+)
+_DISARM_MESSAGES = (
+    "Desarmando partição %s",
+    "Partição %s desarmada com sucesso",
+    "Resposta inesperada ao desarmar: 0x%02X",
+    "Timeout ao aguardar confirmação de desarmamento",
+)
+_BYPASS_MESSAGES = (
+    "Fazendo bypass da zona %s",
+    "Zona %s em bypass",
+    "Resposta inesperada ao fazer bypass: 0x%02X",
+    "Timeout ao aguardar confirmação de bypass",
+)
+
+
+class _CommandList:
+    """Formata comandos esperados só quando a mensagem de log é emitida"""
+
+    __slots__ = ('commands',)
+
+    def __init__(self, commands):
+        self.commands = commands
+
+    def __str__(self):
+        return str([f'0x{c:02X}' for c in sorted(self.commands)])
+
+
+@dataclass
+class Event:
+    """
+    Evento em tempo real recebido do painel (0xEX)
+    
+    Attributes:
+        command: int - byte de comando (0xE0-0xEF)
+        event_group: int - grupo do evento
+        event_1: int - evento 1
+        event_2: int - evento 2
+        partition: int - partição
+        label_type: int - tipo do label
+        label: str - label (nome da zona/partição/usuário)
+    """
+    
+    # __slots__ explícito (Python 3.8 não suporta dataclass(slots=True))
+    __slots__ = ('command', 'event_group', 'event_1', 'event_2',
+                 'partition', 'label_type', 'label')
+    
+    command: int
+    event_group: int
+    event_1: int
+    event_2: int
+    partition: int
+    label_type: int
+    label: str
+
+
+@dataclass(frozen=True)
+class PanelInfo:
+    """
+    Informações do painel obtidas no handshake (InitiateCommunication)
+    
+    Attributes:
+        product_id: int - ID do produto
+        product_name: str - nome do produto (ex: "MAGELLAN_MG5050")
+        firmware_version: tuple - (versão, revisão, minor)
+        firmware_string: str - versão formatada (ex: "4.1.2")
+        panel_id: int - ID do painel
+        pc_password: bytes - senha PC informada pelo painel
+        source_id: int - ID da origem da comunicação
+    """
+    
+    # __slots__ explícito (Python 3.8 não suporta dataclass(slots=True))
+    __slots__ = ('product_id', 'product_name', 'firmware_version',
+                 'firmware_string', 'panel_id', 'pc_password', 'source_id')
+    
+    product_id: int
+    product_name: str
+    firmware_version: tuple
+    firmware_string: str
+    panel_id: int
+    pc_password: bytes
+    source_id: int
+
 
 class ParadoxPanel:
     """
@@ -19,7 +114,7 @@ class ParadoxPanel:
     Attributes:
         connection: SerialConnection - conexão serial
         config: dict - configuração do painel
-        panel_info: dict - informações do painel (após handshake)
+        panel_info: PanelInfo - informações do painel (após handshake)
     """
     
     def __init__(self, connection, config):
@@ -32,8 +127,10 @@ class ParadoxPanel:
         """
         self.connection = connection
         self.config = config
-        self.panel_info = {}
+        self.panel_info = None
         self._authenticated = False
+        self._pc_password_bytes = None  # senha PC codificada (cache)
+        self._rx_buf = bytearray(37)  # buffer de recepção reaproveitado
     
     def encode_password(self, password):
         """
@@ -53,11 +150,14 @@ class ParadoxPanel:
         
         try:
             # Converte string hex para 2 bytes
-            byte1 = int(password[0:2], 16)
-            byte2 = int(password[2:4], 16)
-            return bytes([byte1, byte2])
+            encoded = bytes.fromhex(password)
         except ValueError:
+            encoded = b''
+        
+        # fromhex() ignora espaços (ex: " 12 "), então confere o tamanho
+        if len(encoded) != 2:
             raise ValueError("Senha PC deve conter apenas caracteres hexadecimais (0-9, a-f)")
+        return encoded
     
     def initiate_communication(self):
         """
@@ -66,7 +166,7 @@ class ParadoxPanel:
         Envia comando 0x72 e aguarda resposta com informações do painel.
         
         Returns:
-            dict - informações do painel ou None se falhar
+            PanelInfo - informações do painel ou None se falhar
         """
         logger.info("Iniciando comunicação com painel (InitiateCommunication)")
         
@@ -85,30 +185,26 @@ class ParadoxPanel:
         
         # Faz parse da resposta
         try:
-            parsed = protocol.InitiateCommunicationResponse.parse(response)
+            parsed = protocol.parse_initiate_communication_response(response)
             
             # Extrai informações do painel
-            self.panel_info = {
-                'product_id': parsed.fields.product_id,
-                'firmware_version': (
-                    parsed.fields.firmware_version.version,
-                    parsed.fields.firmware_version.revision,
-                    parsed.fields.firmware_version.minor
-                ),
-                'firmware_string': f"{parsed.fields.firmware_version.version}.{parsed.fields.firmware_version.revision}.{parsed.fields.firmware_version.minor}",
-                'panel_id': parsed.fields.panel_id,
-                'pc_password': parsed.fields.pc_password,
-                'source_id': parsed.fields.source_id,
-            }
+            self.panel_info = info = PanelInfo(
+                product_id=parsed.product_id,
+                product_name=protocol.get_product_name(parsed.product_id),
+                firmware_version=(parsed.version, parsed.revision, parsed.minor),
+                firmware_string=f"{parsed.version}.{parsed.revision}.{parsed.minor}",
+                panel_id=parsed.panel_id,
+                pc_password=parsed.pc_password,
+                source_id=parsed.source_id,
+            )
             
-            logger.info(f"Painel identificado: {self.panel_info['product_id']} "
-                       f"Firmware: {self.panel_info['firmware_string']} "
-                       f"Panel ID: {self.panel_info['panel_id']}")
+            logger.info("Painel identificado: %s Firmware: %s Panel ID: %s",
+                        info.product_name, info.firmware_string, info.panel_id)
             
             return self.panel_info
             
         except Exception as e:
-            logger.error(f"Erro ao processar resposta do painel: {e}")
+            logger.error("Erro ao processar resposta do painel: %s", e)
             return None
     
     def initialize_communication(self):
@@ -126,15 +222,17 @@ class ParadoxPanel:
         
         logger.info("Autenticando com painel (InitializeCommunication MG/SP)")
         
-        # Codifica senha PC
-        pc_password_str = self.config.get('pc_password', '0000')
-        pc_password_bytes = self.encode_password(pc_password_str)
+        # Codifica senha PC (uma vez por instância)
+        if self._pc_password_bytes is None:
+            pc_password_str = self.config.get('pc_password', '0000')
+            self._pc_password_bytes = self.encode_password(pc_password_str)
+        pc_password_bytes = self._pc_password_bytes
         
         # Constrói comando de autenticação
         cmd = protocol.build_initialize_communication_mgsp(
-            product_id=self.panel_info['product_id'],
-            firmware_version=self.panel_info['firmware_version'],
-            panel_id=self.panel_info['panel_id'],
+            product_id=self.panel_info.product_id,
+            firmware_version=self.panel_info.firmware_version,
+            panel_id=self.panel_info.panel_id,
             pc_password_bytes=pc_password_bytes,
             source_id=0x01,  # Panel App
             user_id=0x00
@@ -143,7 +241,7 @@ class ParadoxPanel:
         self.connection.write(cmd)
         
         # Aguarda resposta
-        response = self.wait_for_response([0x10, 0x70], timeout=5)
+        response = self.wait_for_response(_INITIALIZE_RESPONSES, timeout=5)
         if response is None:
             logger.error("Nenhuma resposta de autenticação recebida")
             return False
@@ -158,7 +256,7 @@ class ParadoxPanel:
             logger.error("Falha na autenticação - senha PC incorreta")
             return False
         else:
-            logger.error(f"Resposta de autenticação inesperada: 0x{result_code:02X}")
+            logger.error("Resposta de autenticação inesperada: 0x%02X", result_code)
             return False
     
     def parse_message(self, data, direction="RX"):
@@ -170,13 +268,13 @@ class ParadoxPanel:
             direction: str - "RX" ou "TX" para logging
         
         Returns:
-            dict - mensagem parseada ou None
+            namedtuple - campos da mensagem ou None
         """
         if len(data) < 2:
             return None
         
         command = data[0]
-        logger.debug(f"[{direction}] Processando comando 0x{command:02X}")
+        logger.debug("[%s] Processando comando 0x%02X", direction, command)
         
         parsed = protocol.parse_message(data)
         return parsed
@@ -186,35 +284,54 @@ class ParadoxPanel:
         Aguarda resposta com comando específico
         
         Args:
-            expected_command: int ou list - comando(s) esperado(s)
+            expected_command: int ou coleção (list/set/frozenset) - comando(s) esperado(s)
             timeout: float - tempo máximo de espera
         
         Returns:
             bytes - mensagem recebida ou None se timeout
         """
         if isinstance(expected_command, int):
-            expected_command = [expected_command]
+            expected_command = (expected_command,)
         
-        start_time = time.time()
+        # Relógio monotônico: imune a ajustes de hora (NTP) durante a espera
+        monotonic = time.monotonic
+        deadline = monotonic() + timeout
         
-        while (time.time() - start_time) < timeout:
-            # Verifica se há dados disponíveis
-            if self.connection.available() > 0:
-                # Lê mensagem
-                data = self.connection.read_variable_length()
-                
-                if len(data) > 0:
-                    command = data[0]
-                    if command in expected_command:
-                        return data
-                    else:
-                        logger.warning(f"Comando inesperado recebido: 0x{command:02X}, "
-                                     f"esperado: {[f'0x{c:02X}' for c in expected_command]}")
+        if self.connection.rx_queue is not None:
+            # Thread leitora ativa: aguarda diretamente na fila de recepção
+            receive = self.connection.receive
+        else:
+            # Bloqueia na leitura (select/read) até chegar dado ou expirar,
+            # escrevendo no buffer reaproveitado em vez de alocar por quadro
+            buf = self._rx_buf
+            view = memoryview(buf)
+            read_into = self.connection.read_into
             
-            # Pequena pausa para não sobrecarregar CPU
-            time.sleep(0.01)
+            def receive(wait):
+                return view[:read_into(buf, initial_timeout=wait)]
         
-        logger.warning(f"Timeout aguardando resposta. Esperado: {[f'0x{c:02X}' for c in expected_command]}")
+        while True:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            
+            data = receive(remaining)
+            
+            if len(data) > 0:
+                command = data[0]
+                if not protocol.is_checksum_valid(data):
+                    # Ruído na linha: descarta antes de casar o comando
+                    logger.warning("Checksum inválido na mensagem 0x%02X - descartada", command)
+                    continue
+                if command in expected_command:
+                    # Só a resposta esperada é copiada para fora do buffer
+                    return bytes(data)
+                else:
+                    logger.warning("Comando inesperado recebido: 0x%02X, esperado: %s",
+                                   command, _CommandList(expected_command))
+        
+        logger.warning("Timeout aguardando resposta. Esperado: %s",
+                       _CommandList(expected_command))
         return None
     
     def send_command(self, command_data, expected_response=None, timeout=5):
@@ -252,40 +369,21 @@ class ParadoxPanel:
         Returns:
             bool - True se comando enviado com sucesso
         """
-        if not self._authenticated:
-            logger.error("Não autenticado - execute initialize_communication() primeiro")
+        if not self._check_authenticated():
             return False
         
-        # Mapeia modo para código de ação
-        action_code = protocol.PARTITION_ACTIONS.get(mode)
+        # Mapeia modo para código de ação (modo padrão sem lookup)
+        if mode == 'arm' or mode == 'arm_away':
+            action_code = protocol.ARM_AWAY
+        else:
+            action_code = protocol.PARTITION_ACTIONS.get(mode)
         if action_code is None:
-            logger.error(f"Modo de armamento inválido: {mode}")
+            logger.error("Modo de armamento inválido: %s", mode)
             return False
         
-        logger.info(f"Armando partição {partition} (modo: {mode})")
-        
-        # Constrói comando
-        cmd = protocol.build_perform_action(
-            action=action_code,
-            argument=partition - 1,  # Partições são 0-indexed no protocolo
-            source_id=0x01,
-            user_id=0x00
-        )
-        
-        # Envia e aguarda resposta
-        response = self.send_command(cmd, expected_response=list(range(0x40, 0x50)), timeout=5)
-        
-        if response:
-            result_code = response[0]
-            if result_code == 0x40:
-                logger.info(f"Partição {partition} armada com sucesso")
-                return True
-            else:
-                logger.warning(f"Resposta inesperada ao armar: 0x{result_code:02X}")
-                return False
-        else:
-            logger.error("Timeout ao aguardar confirmação de armamento")
-            return False
+        # Partições são 0-indexed no protocolo
+        return self._do_action(action_code, partition - 1,
+                               _ARM_MESSAGES, partition, mode)
     
     def disarm_partition(self, partition):
         """
@@ -297,34 +395,11 @@ class ParadoxPanel:
         Returns:
             bool - True se comando enviado com sucesso
         """
-        if not self._authenticated:
-            logger.error("Não autenticado - execute initialize_communication() primeiro")
+        if not self._check_authenticated():
             return False
         
-        logger.info(f"Desarmando partição {partition}")
-        
-        # Constrói comando
-        cmd = protocol.build_perform_action(
-            action=protocol.PARTITION_ACTIONS['disarm'],
-            argument=partition - 1,
-            source_id=0x01,
-            user_id=0x00
-        )
-        
-        # Envia e aguarda resposta
-        response = self.send_command(cmd, expected_response=list(range(0x40, 0x50)), timeout=5)
-        
-        if response:
-            result_code = response[0]
-            if result_code == 0x40:
-                logger.info(f"Partição {partition} desarmada com sucesso")
-                return True
-            else:
-                logger.warning(f"Resposta inesperada ao desarmar: 0x{result_code:02X}")
-                return False
-        else:
-            logger.error("Timeout ao aguardar confirmação de desarmamento")
-            return False
+        return self._do_action(protocol.DISARM, partition - 1,
+                               _DISARM_MESSAGES, partition)
     
     def bypass_zone(self, zone):
         """
@@ -336,33 +411,61 @@ class ParadoxPanel:
         Returns:
             bool - True se comando enviado com sucesso
         """
+        if not self._check_authenticated():
+            return False
+        
+        return self._do_action(protocol.BYPASS, zone - 1,
+                               _BYPASS_MESSAGES, zone)
+    
+    def _check_authenticated(self):
+        """
+        Verifica se a autenticação já foi feita, registrando erro se não
+        
+        Returns:
+            bool - True se autenticado
+        """
         if not self._authenticated:
             logger.error("Não autenticado - execute initialize_communication() primeiro")
             return False
+        return True
+    
+    def _do_action(self, action_code, argument, messages, *log_args):
+        """
+        Envia PerformAction e aguarda confirmação
+        
+        Args:
+            action_code: int - código da ação (ver protocol.*_ACTIONS)
+            argument: int - argumento já 0-indexed (partição/zona)
+            messages: tuple - mensagens de log (ver _ARM_MESSAGES)
+            *log_args: argumentos das mensagens (número 1-indexed primeiro)
         
-        logger.info(f"Fazendo bypass da zona {zone}")
+        Returns:
+            bool - True se painel confirmou com sucesso (0x40)
+        """
+        start_message, success_message, unexpected_message, timeout_message = messages
+        logger.info(start_message, *log_args)
         
         # Constrói comando
         cmd = protocol.build_perform_action(
-            action=protocol.ZONE_ACTIONS['bypass'],
-            argument=zone - 1,
+            action=action_code,
+            argument=argument,
             source_id=0x01,
             user_id=0x00
         )
         
         # Envia e aguarda resposta
-        response = self.send_command(cmd, expected_response=list(range(0x40, 0x50)), timeout=5)
+        response = self.send_command(cmd, expected_response=_PERFORM_ACTION_RESPONSES, timeout=5)
         
         if response:
             result_code = response[0]
             if result_code == 0x40:
-                logger.info(f"Zona {zone} em bypass")
+                logger.info(success_message, log_args[0])
                 return True
             else:
-                logger.warning(f"Resposta inesperada ao fazer bypass: 0x{result_code:02X}")
+                logger.warning(unexpected_message, result_code)
                 return False
         else:
-            logger.error("Timeout ao aguardar confirmação de bypass")
+            logger.error(timeout_message)
             return False
     
     def read_status(self, address=0x0000, records=1):
@@ -380,7 +483,7 @@ class ParadoxPanel:
             logger.error("Não autenticado - execute initialize_communication() primeiro")
             return None
         
-        logger.info(f"Lendo EEPROM endereço 0x{address:04X} ({records} registro(s))")
+        logger.info("Lendo EEPROM endereço 0x%04X (%d registro(s))", address, records)
         
         # Constrói comando
         cmd = protocol.build_read_eeprom(
@@ -391,15 +494,15 @@ class ParadoxPanel:
         )
         
         # Envia e aguarda resposta
-        response = self.send_command(cmd, expected_response=list(range(0x50, 0x60)), timeout=5)
+        response = self.send_command(cmd, expected_response=_EEPROM_RESPONSES, timeout=5)
         
         if response:
             try:
-                parsed = protocol.ReadEEPROMResponse.parse(response)
-                logger.info(f"Dados EEPROM lidos: {len(parsed.fields.data)} bytes")
-                return parsed.fields.data
+                parsed = protocol.parse_read_eeprom_response(response)
+                logger.info("Dados EEPROM lidos: %d bytes", len(parsed.data))
+                return parsed.data
             except Exception as e:
-                logger.error(f"Erro ao processar resposta EEPROM: {e}")
+                logger.error("Erro ao processar resposta EEPROM: %s", e)
                 return None
         else:
             logger.error("Timeout ao aguardar resposta EEPROM")
@@ -413,29 +516,29 @@ class ParadoxPanel:
             event_data: bytes - dados do evento (0xEX)
         
         Returns:
-            dict - evento parseado ou None
+            Event - evento parseado ou None
         """
         try:
-            parsed = protocol.LiveEvent.parse(event_data)
+            parsed = protocol.parse_live_event(event_data)
             
-            event_info = {
-                'command': parsed.fields.po.command,
-                'event_group': parsed.fields.event_group,
-                'event_1': parsed.fields.event_1,
-                'event_2': parsed.fields.event_2,
-                'partition': parsed.fields.partition,
-                'label_type': parsed.fields.label_type,
-                'label': parsed.fields.label.decode('ascii', errors='ignore').strip('\x00'),
-            }
+            event_info = Event(
+                command=parsed.command,
+                event_group=parsed.event_group,
+                event_1=parsed.event_1,
+                event_2=parsed.event_2,
+                partition=parsed.partition,
+                label_type=parsed.label_type,
+                label=parsed.label.rstrip(b'\x00').decode('ascii', 'replace'),
+            )
             
-            logger.info(f"Evento recebido: Grupo={event_info['event_group']} "
-                       f"Partição={event_info['partition']} "
-                       f"Label={event_info['label']}")
+            logger.info("Evento recebido: Grupo=%s Partição=%s Label=%s",
+                        event_info.event_group, event_info.partition,
+                        event_info.label)
             
             return event_info
             
         except Exception as e:
-            logger.error(f"Erro ao processar evento: {e}")
+            logger.error("Erro ao processar evento: %s", e)
             return None
     
     def monitor_events(self, duration=None):
@@ -446,35 +549,29 @@ class ParadoxPanel:
             duration: float - duração em segundos (None = indefinido)
         
         Yields:
-            dict - eventos recebidos
+            Event - eventos recebidos
         """
-        logger.info(f"Monitorando eventos{' por ' + str(duration) + 's' if duration else ' (pressione Ctrl+C para parar)'}")
-        
-        start_time = time.time()
+        if duration:
+            logger.info("Monitorando eventos por %ss", duration)
+        else:
+            logger.info("Monitorando eventos (pressione Ctrl+C para parar)")
         
         try:
-            while True:
-                # Verifica se deve parar
-                if duration and (time.time() - start_time) >= duration:
-                    break
+            for data in self.connection.read_stream(duration=duration or None):
+                command = data[0]
                 
-                # Verifica se há dados disponíveis
-                if self.connection.available() > 0:
-                    data = self.connection.read_variable_length()
-                    
-                    if len(data) > 0:
-                        command = data[0]
-                        
-                        # Eventos são 0xE0-0xEF
-                        if 0xE0 <= command <= 0xEF:
-                            event = self.handle_live_event(data)
-                            if event:
-                                yield event
-                        else:
-                            # Outras mensagens
-                            logger.debug(f"Mensagem não-evento recebida: 0x{command:02X}")
-                
-                time.sleep(0.01)
+                if not protocol.is_checksum_valid(data):
+                    logger.warning("Checksum inválido na mensagem 0x%02X - descartada", command)
+                    continue
                 
+                # Eventos são 0xE0-0xEF
+                if 0xE0 <= command <= 0xEF:
+                    event = self.handle_live_event(data)
+                    if event:
+                        yield event
+                else:
+                    # Outras mensagens
+                    logger.debug("Mensagem não-evento recebida: 0x%02X", command)
+        
         except KeyboardInterrupt:
             logger.info("Monitoramento interrompido pelo usuário")
@@ -5,11 +5,9 @@ Implementa o protocolo de comunicação serial com centrais Paradox MG/SP/Digipl
 baseado na engenharia reversa do projeto ParadoxAlarmInterface/pai.
 """
 
-from construct import (
-    Struct, Bytes, Int8ub, Int16ub, Enum, Const, Padding, 
-    this, Computed, GreedyBytes, Flag, Array
-)
+from collections import namedtuple
 import logging
+import struct
 
 logger = logging.getLogger(__name__)
 
@@ -22,66 +20,88 @@ def calculate_checksum(data):
     Calcula checksum como soma de todos os bytes módulo 256
     
     Args:
-        data: bytes - dados para calcular checksum
+        data: bytes, bytearray, memoryview ou list - dados para calcular checksum
+              (passe memoryview(msg)[:n] em vez de msg[:n] para evitar cópia)
     
     Returns:
         int - checksum (0-255)
     """
-    if isinstance(data, (list, tuple)):
-        return sum(data) % 256
-    return sum(data) % 256
+    return sum(data) & 0xFF
+
+
+def is_checksum_valid(data):
+    """
+    Confere o checksum (byte 36) de uma mensagem completa de 37 bytes
+    
+    Mensagens mais curtas (ex: resposta 0x10 lida com 16 bytes) não são
+    verificadas e retornam True.
+    
+    Args:
+        data: bytes, bytearray ou memoryview - mensagem recebida
+    
+    Returns:
+        bool - False se o checksum não confere
+    """
+    if len(data) < 37:
+        return True
+    return calculate_checksum(memoryview(data)[:36]) == data[36]
 
 
 # ===============================================================================
 # ENUMERAÇÕES
 # ===============================================================================
 
-ProductIdEnum = Enum(
-    Int8ub,
-    DIGIPLEX_DGP2_48_NE=0,
-    DIGIPLEX_DGP2_72_NE=1,
-    DIGIPLEX_DGP2_96_NE=2,
-    DIGIPLEX_DGP2_112_NE=3,
-    DIGIPLEX_DGP2_816_NE=4,
-    DIGIPLEX_DGP2_248_NE=5,
-    MAGELLAN_MG5000=2,
-    MAGELLAN_MG5050=4,
-    SPECTRA_SP4000=5,
-    SPECTRA_SP5500=21,
-    SPECTRA_SP6000=22,
-    SPECTRA_SP7000=23,
-    SPECTRA_SP65=24,
-)
-
-CommunicationSourceIDEnum = Enum(
-    Int8ub,
-    BOOT_LOADER=0,
-    PANEL_APP=1,
-    NEware=2,
-    IP100=4,
-    Winload=5,
-    WinloadApp=6,
-    default=1
-)
+# IDs de produto (nome -> byte). Famílias diferentes compartilham IDs
+# (ex: 4); no decode prevalece o último nome declarado.
+PRODUCT_IDS = {
+    'DIGIPLEX_DGP2_48_NE': 0,
+    'DIGIPLEX_DGP2_72_NE': 1,
+    'DIGIPLEX_DGP2_96_NE': 2,
+    'DIGIPLEX_DGP2_112_NE': 3,
+    'DIGIPLEX_DGP2_816_NE': 4,
+    'DIGIPLEX_DGP2_248_NE': 5,
+    'MAGELLAN_MG5000': 2,
+    'MAGELLAN_MG5050': 4,
+    'SPECTRA_SP4000': 5,
+    'SPECTRA_SP5500': 21,
+    'SPECTRA_SP6000': 22,
+    'SPECTRA_SP7000': 23,
+    'SPECTRA_SP65': 24,
+}
+
+# Origem da comunicação (nome -> byte); builders usam PANEL_APP por padrão
+COMMUNICATION_SOURCE_IDS = {
+    'BOOT_LOADER': 0,
+    'PANEL_APP': 1,
+    'NEware': 2,
+    'IP100': 4,
+    'Winload': 5,
+    'WinloadApp': 6,
+}
 
 # ===============================================================================
 # CONSTANTES DE AÇÕES
 # ===============================================================================
 
+# Códigos das ações mais usadas (acesso direto, sem lookup em dicionário)
+ARM_AWAY = 0x04
+DISARM = 0x05
+BYPASS = 0x10
+
 # Ações de Partição
 PARTITION_ACTIONS = {
     'arm_stay': 0x01,
     'arm_sleep': 0x02,
-    'arm': 0x04,           # arm_away / regular arm
-    'disarm': 0x05,
+    'arm': ARM_AWAY,       # arm_away / regular arm
+    'disarm': DISARM,
     'arm_stay_instant': 0x06,
     'arm_instant': 0x07,
 }
 
 # Ações de Zona
 ZONE_ACTIONS = {
-    'bypass': 0x10,
-    'clear_bypass': 0x10,  # Mesmo código, toggle
+    'bypass': BYPASS,
+    'clear_bypass': BYPASS,  # Mesmo código, toggle
 }
 
 # Ações PGM
@@ -93,187 +113,149 @@ PGM_ACTIONS = {
 }
 
 # ===============================================================================
-# PARSERS - COMUNICAÇÃO INICIAL
+# PARSERS (struct)
 # ===============================================================================
 
-# Mensagem: Initiate Communication (0x72 0x00)
-# PC -> Panel: Inicia handshake
-InitiateCommunication = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Const(0x72, Int8ub),
-        ),
-        "reserved_0" / Padding(34),
-        "user_id" / Int8ub,
-    ),
-    "checksum" / Int8ub,
-)
+# Todas as mensagens têm 37 bytes com campos em offsets fixos (big-endian,
+# checksum no último byte): o parse é feito com struct.unpack_from (C) e
+# devolvido como namedtuple.
 
 # Mensagem: Initiate Communication Response (0x72 0xFF)
 # Panel -> PC: Responde com informações do painel
-InitiateCommunicationResponse = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Const(0x72, Int8ub),
-            "result" / Const(0xFF, Int8ub),
-        ),
-        "reserved_0" / Bytes(4),
-        "product_id" / ProductIdEnum,
-        "firmware_version" / Struct(
-            "version" / Int8ub,
-            "revision" / Int8ub,
-            "minor" / Int8ub,
-        ),
-        "panel_id" / Int16ub,
-        "pc_password" / Bytes(2),
-        "modem_speed" / Int8ub,
-        "reserved_1" / Bytes(14),
-        "source_id" / Int8ub,
-        "user_id" / Int8ub,
-        "receiver_line" / Bytes(4),
-        "reserved_2" / Bytes(1),
-    ),
-    "checksum" / Int8ub,
-)
-
-# ===============================================================================
-# PARSERS - AUTENTICAÇÃO MG/SP
-# ===============================================================================
+InitiateCommunicationResponseFields = namedtuple('InitiateCommunicationResponseFields', [
+    'command', 'result', 'reserved_0', 'product_id', 'version', 'revision', 'minor',
+    'panel_id', 'pc_password', 'modem_speed', 'reserved_1', 'source_id', 'user_id',
+    'receiver_line', 'reserved_2', 'checksum',
+])
+_INITIATE_COMMUNICATION_RESPONSE = struct.Struct('>BB4sBBBBH2sB14sBB4s1sB')
 
 # Mensagem: Initialize Communication MG/SP (0x00)
 # PC -> Panel: Autenticação com senha PC
-InitializeCommunication_MGSP = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Const(0x00, Int8ub),
-        ),
-        "product_id" / ProductIdEnum,
-        "firmware_version" / Struct(
-            "version" / Int8ub,
-            "revision" / Int8ub,
-            "minor" / Int8ub,
-        ),
-        "panel_id" / Int16ub,
-        "pc_password" / Bytes(2),
-        "reserved_0" / Bytes(3),
-        "source_id" / CommunicationSourceIDEnum,
-        "user_id" / Const(0x00, Int8ub),
-        "reserved_1" / Bytes(19),
-    ),
-    "checksum" / Int8ub,
-)
-
-# Mensagem: Initialize Communication Response MG/SP (0x10 = sucesso, 0x70 = falha)
-InitializeCommunicationResponse_MGSP = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Int8ub,  # 0x10 sucesso, 0x70 falha senha
-        ),
-        "reserved_0" / Bytes(33),
-        "user_id" / Int8ub,
-    ),
-    "checksum" / Int8ub,
-)
+InitializeCommunicationFields = namedtuple('InitializeCommunicationFields', [
+    'command', 'product_id', 'version', 'revision', 'minor', 'panel_id',
+    'pc_password', 'reserved_0', 'source_id', 'user_id', 'reserved_1', 'checksum',
+])
+_INITIALIZE_COMMUNICATION_MGSP = struct.Struct('>BBBBBH2s3sBB19sB')
+
+# Mensagens: Initialize Communication Response MG/SP (0x10 = sucesso,
+# 0x70 = falha senha) e Perform Action Response (0x40-0x4F)
+ResponseFields = namedtuple('ResponseFields', ['command', 'reserved_0', 'user_id', 'checksum'])
+_RESPONSE = struct.Struct('>B33sBB')
+
+# Mensagem: Read EEPROM Response (0x50-0x5F)
+# Panel -> PC: Dados da EEPROM
+ReadEEPROMResponseFields = namedtuple('ReadEEPROMResponseFields', [
+    'command', 'reserved_0', 'address', 'records', 'data', 'checksum',
+])
+_READ_EEPROM_RESPONSE = struct.Struct('>B1sHB27sB')
 
-# ===============================================================================
-# PARSERS - COMANDOS E RESPOSTAS
-# ===============================================================================
+# Mensagem: Live Event (0xE0-0xEF)
+# Panel -> PC: Eventos em tempo real (zonas, partições, alarmes)
+LiveEventFields = namedtuple('LiveEventFields', [
+    'command', 'reserved_0', 'event_group', 'event_1', 'event_2', 'partition',
+    'module_serial', 'label_type', 'label', 'reserved_1', 'user_id', 'checksum',
+])
+_LIVE_EVENT = struct.Struct('>B1sBBBB4sB16s6sBB')
 
-# Mensagem: Perform Action (0x40)
-# PC -> Panel: Executa ação (arm/disarm/bypass/pgm)
-PerformAction = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Const(0x40, Int8ub),
-        ),
-        "reserved_0" / Bytes(3),
-        "action" / Int8ub,        # Código da ação (ex: 0x04=arm, 0x05=disarm)
-        "argument" / Int8ub,      # Argumento (número da partição/zona)
-        "reserved_1" / Bytes(27),
-        "source_id" / CommunicationSourceIDEnum,
-        "user_id" / Int8ub,
-    ),
-    "checksum" / Int8ub,
-)
-
-# Mensagem: Perform Action Response (0x4X)
-# Panel -> PC: Resultado da ação
-PerformActionResponse = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Int8ub,  # 0x40-0x4F dependendo do resultado
-        ),
-        "reserved_0" / Bytes(33),
-        "user_id" / Int8ub,
-    ),
-    "checksum" / Int8ub,
-)
 
-# ===============================================================================
-# PARSERS - LEITURA DE MEMÓRIA (EEPROM)
-# ===============================================================================
+def parse_initiate_communication_response(data):
+    """
+    Faz parse de InitiateCommunicationResponse (0x72 0xFF)
+    
+    Args:
+        data: bytes - mensagem completa (37 bytes)
+    
+    Returns:
+        InitiateCommunicationResponseFields - campos da mensagem
+    
+    Raises:
+        ValueError - se cabeçalho não for 0x72 0xFF
+        struct.error - se mensagem for curta demais
+    """
+    fields = InitiateCommunicationResponseFields._make(
+        _INITIATE_COMMUNICATION_RESPONSE.unpack_from(data))
+    if fields.command != 0x72 or fields.result != 0xFF:
+        raise ValueError(f"Cabeçalho inválido: 0x{fields.command:02X} 0x{fields.result:02X}")
+    return fields
 
-# Mensagem: Read EEPROM (0x50)
-# PC -> Panel: Lê memória do painel (status/configuração/eventos)
-ReadEEPROM = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Const(0x50, Int8ub),
-        ),
-        "reserved_0" / Bytes(1),
-        "address" / Int16ub,      # Endereço EEPROM para ler
-        "records" / Int8ub,       # Número de registros
-        "reserved_1" / Bytes(28),
-        "source_id" / CommunicationSourceIDEnum,
-        "user_id" / Int8ub,
-    ),
-    "checksum" / Int8ub,
-)
-
-# Mensagem: Read EEPROM Response (0x5X)
-# Panel -> PC: Dados da EEPROM
-ReadEEPROMResponse = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Int8ub,  # 0x50-0x5F
-        ),
-        "reserved_0" / Bytes(1),
-        "address" / Int16ub,
-        "records" / Int8ub,
-        "data" / Bytes(32 - 5),  # Dados lidos (restante do payload)
-    ),
-    "checksum" / Int8ub,
-)
 
-# ===============================================================================
-# PARSERS - EVENTOS EM TEMPO REAL
-# ===============================================================================
+def parse_initialize_communication_mgsp(data):
+    """Faz parse de InitializeCommunication MG/SP (0x00)"""
+    return InitializeCommunicationFields._make(_INITIALIZE_COMMUNICATION_MGSP.unpack_from(data))
+
+
+def parse_response(data):
+    """Faz parse de InitializeCommunicationResponse_MGSP (0x10/0x70) e PerformActionResponse (0x4X)"""
+    return ResponseFields._make(_RESPONSE.unpack_from(data))
+
+
+def parse_read_eeprom_response(data):
+    """Faz parse de ReadEEPROMResponse (0x5X)"""
+    return ReadEEPROMResponseFields._make(_READ_EEPROM_RESPONSE.unpack_from(data))
+
+
+def parse_live_event(data):
+    """Faz parse de LiveEvent (0xEX)"""
+    return LiveEventFields._make(_LIVE_EVENT.unpack_from(data))
+
+
+def _build_product_id_names():
+    """
+    Monta tabela de 256 entradas: ID do produto -> nome
+    
+    IDs compartilhados entre famílias (ex: 4) resolvem para o último nome
+    declarado em PRODUCT_IDS.
+    
+    Returns:
+        tuple - nomes indexados pelo byte de product_id
+    """
+    names = ["UNKNOWN"] * 256
+    for name, product_id in PRODUCT_IDS.items():
+        names[product_id] = name
+    return tuple(names)
+
+
+# Indexação direta em vez de busca reversa em PRODUCT_IDS
+_PRODUCT_ID_NAMES = _build_product_id_names()
+
+
+def get_product_name(product_id):
+    """
+    Retorna nome do produto a partir do ID
+    
+    Args:
+        product_id: int - ID do produto (0-255)
+    
+    Returns:
+        str - nome do produto ou "UNKNOWN"
+    """
+    return _PRODUCT_ID_NAMES[product_id]
 
-# Mensagem: Live Event (0xEX)
-# Panel -> PC: Eventos em tempo real (zonas, partições, alarmes)
-LiveEvent = Struct(
-    "fields" / Struct(
-        "po" / Struct(
-            "command" / Int8ub,  # 0xE0-0xEF
-        ),
-        "reserved_0" / Bytes(1),
-        "event_group" / Int8ub,   # Grupo do evento
-        "event_1" / Int8ub,       # Evento 1
-        "event_2" / Int8ub,       # Evento 2
-        "partition" / Int8ub,     # Partição
-        "module_serial" / Bytes(4),
-        "label_type" / Int8ub,
-        "label" / Bytes(16),
-        "reserved_1" / Bytes(6),
-        "user_id" / Int8ub,
-    ),
-    "checksum" / Int8ub,
-)
 
 # ===============================================================================
 # PARSER GENÉRICO
 # ===============================================================================
 
+def _build_parser_table():
+    """Constrói tabela de 256 entradas: byte de comando -> função de parse"""
+    table = [None] * 256
+    table[0x72] = parse_initiate_communication_response  # Pode ser request ou response
+    table[0x00] = parse_initialize_communication_mgsp
+    table[0x10] = parse_response
+    table[0x70] = parse_response  # Falha de senha
+    for command in range(0x40, 0x50):
+        table[command] = parse_response
+    for command in range(0x50, 0x60):
+        table[command] = parse_read_eeprom_response
+    for command in range(0xE0, 0xF0):
+        table[command] = parse_live_event
+    return tuple(table)
+
+
+# Indexada diretamente pelo primeiro byte da mensagem
+PARSER_TABLE = _build_parser_table()
+
+
 def get_parser_by_command(command_byte):
     """
     Retorna o parser apropriado baseado no byte de comando
@@ -282,26 +264,9 @@ def get_parser_by_command(command_byte):
         command_byte: int - primeiro byte da mensagem
     
     Returns:
-        Parser construct ou None
+        função de parse ou None
     """
-    parsers = {
-        0x72: InitiateCommunicationResponse,  # Pode ser request ou response
-        0x00: InitializeCommunication_MGSP,
-        0x10: InitializeCommunicationResponse_MGSP,
-        0x70: InitializeCommunicationResponse_MGSP,  # Falha de senha
-        0x40: PerformAction,
-        0x50: ReadEEPROM,
-    }
-    
-    # Comandos com range
-    if 0x40 <= command_byte <= 0x4F:
-        return PerformActionResponse
-    if 0x50 <= command_byte <= 0x5F:
-        return ReadEEPROMResponse
-    if 0xE0 <= command_byte <= 0xEF:
-        return LiveEvent
-    
-    return parsers.get(command_byte)
+    return PARSER_TABLE[command_byte]
 
 
 def parse_message(data):
@@ -312,23 +277,28 @@ def parse_message(data):
         data: bytes - mensagem completa (37 bytes normalmente)
     
     Returns:
-        dict - mensagem parseada ou None se falhar
+        namedtuple - campos da mensagem ou None se falhar
     """
     if len(data) < 2:
         return None
     
+    # Rejeita ruído na linha antes do parse (checksum no byte 36)
+    if not is_checksum_valid(data):
+        logger.warning("Checksum inválido na mensagem 0x%02X", data[0])
+        return None
+
     command_byte = data[0]
-    parser = get_parser_by_command(command_byte)
+    parser = PARSER_TABLE[command_byte]
     
     if parser is None:
-        logger.warning(f"Parser não encontrado para comando 0x{command_byte:02X}")
+        logger.warning("Parser não encontrado para comando 0x%02X", command_byte)
         return None
     
     try:
-        parsed = parser.parse(data)
+        parsed = parser(data)
         return parsed
     except Exception as e:
-        logger.error(f"Erro ao fazer parse da mensagem: {e}")
+        logger.error("Erro ao fazer parse da mensagem: %s", e)
         return None
 
 
@@ -336,13 +306,28 @@ def parse_message(data):
 # BUILDERS - CONSTRUÇÃO DE MENSAGENS
 # ===============================================================================
 
+# Templates de 37 bytes com o byte de comando já preenchido; cada builder
+# copia o template e escreve apenas os campos variáveis
+_TPL_INITIATE_COMMUNICATION = bytes([0x72]) + bytes(36)
+_TPL_INITIALIZE_COMMUNICATION_MGSP = bytes([0x00]) + bytes(36)
+_TPL_PERFORM_ACTION = bytes([0x40]) + bytes(36)
+_TPL_READ_EEPROM = bytes([0x50]) + bytes(36)
+
 def build_initiate_communication(user_id=0x00):
-    """Constrói mensagem InitiateCommunication"""
-    data = bytearray(37)
-    data[0] = 0x72  # Command
+    """
+    Constrói mensagem InitiateCommunication
+    
+    Args:
+        user_id: int - ID do usuário
+    
+    Returns:
+        bytearray - mensagem (37 bytes)
+    """
+    data = bytearray(_TPL_INITIATE_COMMUNICATION)  # Command 0x72
     data[35] = user_id
-    data[36] = calculate_checksum(data[0:36])
-    return bytes(data)
+    # Checksum: template é zero fora dos campos escritos
+    data[36] = (0x72 + user_id) & 0xFF
+    return data
 
 
 def build_initialize_communication_mgsp(product_id, firmware_version, panel_id, pc_password_bytes, source_id=0x01, user_id=0x00):
@@ -356,23 +341,31 @@ def build_initialize_communication_mgsp(product_id, firmware_version, panel_id,
         pc_password_bytes: bytes - senha PC (2 bytes)
         source_id: int - ID da fonte (default Winload=5)
         user_id: int - ID do usuário
+    
+    Returns:
+        bytearray - mensagem (37 bytes)
     """
-    data = bytearray(37)
-    data[0] = 0x00  # Command
+    version, revision, minor = firmware_version
+    panel_id_high = (panel_id >> 8) & 0xFF
+    panel_id_low = panel_id & 0xFF
+    
+    data = bytearray(_TPL_INITIALIZE_COMMUNICATION_MGSP)  # Command 0x00
     data[1] = product_id
-    data[2] = firmware_version[0]
-    data[3] = firmware_version[1]
-    data[4] = firmware_version[2]
-    data[5] = (panel_id >> 8) & 0xFF  # Panel ID high byte
-    data[6] = panel_id & 0xFF         # Panel ID low byte
+    data[2] = version
+    data[3] = revision
+    data[4] = minor
+    data[5] = panel_id_high  # Panel ID high byte
+    data[6] = panel_id_low   # Panel ID low byte
     data[7:9] = pc_password_bytes
     # reserved 9-11
     data[12] = source_id
     data[13] = user_id
     # reserved 14-34
     data[35] = user_id
-    data[36] = calculate_checksum(data[0:36])
-    return bytes(data)
+    # Checksum: template é zero fora dos campos escritos
+    data[36] = (product_id + version + revision + minor + panel_id_high + panel_id_low
+                + data[7] + data[8] + source_id + 2 * user_id) & 0xFF
+    return data
 
 
 def build_perform_action(action, argument, source_id=0x01, user_id=0x00):
@@ -384,9 +377,11 @@ def build_perform_action(action, argument, source_id=0x01, user_id=0x00):
         argument: int - argumento (partição/zona)
         source_id: int - ID da fonte
         user_id: int - ID do usuário
+    
+    Returns:
+        bytearray - mensagem (37 bytes)
     """
-    data = bytearray(37)
-    data[0] = 0x40  # Command
+    data = bytearray(_TPL_PERFORM_ACTION)  # Command 0x40
     # reserved 1-3
     data[4] = action
     data[5] = argument
@@ -394,8 +389,9 @@ def build_perform_action(action, argument, source_id=0x01, user_id=0x00):
     data[33] = source_id
     data[34] = user_id
     data[35] = user_id
-    data[36] = calculate_checksum(data[0:36])
-    return bytes(data)
+    # Checksum: template é zero fora dos campos escritos
+    data[36] = (0x40 + action + argument + source_id + 2 * user_id) & 0xFF
+    return data
 
 
 def build_read_eeprom(address, records=1, source_id=0x01, user_id=0x00):
@@ -407,16 +403,22 @@ def build_read_eeprom(address, records=1, source_id=0x01, user_id=0x00):
         records: int - número de registros
         source_id: int - ID da fonte
         user_id: int - ID do usuário
+    
+    Returns:
+        bytearray - mensagem (37 bytes)
     """
-    data = bytearray(37)
-    data[0] = 0x50  # Command
+    address_high = (address >> 8) & 0xFF
+    address_low = address & 0xFF
+    
+    data = bytearray(_TPL_READ_EEPROM)  # Command 0x50
     # reserved 1
-    data[2] = (address >> 8) & 0xFF  # Address high byte
-    data[3] = address & 0xFF         # Address low byte
+    data[2] = address_high  # Address high byte
+    data[3] = address_low   # Address low byte
     data[4] = records
     # reserved 5-32
     data[33] = source_id
     data[34] = user_id
     data[35] = user_id
-    data[36] = calculate_checksum(data[0:36])
-    return bytes(data)
+    # Checksum: template é zero fora dos campos escritos
+    data[36] = (0x50 + address_high + address_low + records + source_id + 2 * user_id) & 0xFF
+    return data